@@ -6,6 +6,7 @@ from pathlib import Path
 # Добавляем родительскую директорию в путь для импорта
 sys.path.append(str(Path(__file__).parent.parent))
 from dz5.vector_search import VectorSearch
+from dz5.autocomplete import Autocomplete
 
 app = Flask(__name__)
 
@@ -13,8 +14,10 @@ app = Flask(__name__)
 print("Инициализация поисковой системы...")
 searcher = VectorSearch(
     tf_idf_dir=os.path.join(os.path.dirname(os.path.dirname(__file__)), "dz4", "tf_idf_terms"),
-    inverted_index_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), "dz3", "inverted_index.json")
+    inverted_index_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), "dz3", "inverted_index.json"),
+    neighbours_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), "dz5", "neighbours.npz")
 )
+autocomplete = Autocomplete(searcher.inverted_index)
 
 @app.route('/')
 def index():
@@ -42,5 +45,26 @@ def search():
         'results': formatted_results
     })
 
+@app.route('/autocomplete')
+def autocomplete_query():
+    query = request.args.get('q', '')
+    return jsonify({
+        'query': query,
+        'suggestions': autocomplete.complete(query)
+    })
+
+@app.route('/similar/<doc_id>')
+def similar(doc_id):
+    if doc_id not in searcher.neighbour_rows:
+        return jsonify({'error': f'Документ {doc_id} не найден в таблице соседей'})
+
+    top_k = request.args.get('top_k', 10, type=int)
+    results = searcher.similar_documents(doc_id, top_k=top_k)
+
+    return jsonify({
+        'doc_id': doc_id,
+        'results': [{'doc_id': similar_id, 'score': f"{score:.4f}"} for similar_id, score in results]
+    })
+
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
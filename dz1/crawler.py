@@ -1,17 +1,26 @@
 import requests
 from bs4 import BeautifulSoup
 import os
+import sys
+from pathlib import Path
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+from dz1.near_duplicates import MinHashLSH, DUPLICATES_FILE
 
 BASE_URL = "https://en.wikipedia.org/wiki/Special:Random"  
 NUM_PAGES = 100  
 SAVE_DIR = "pages"
 MIN_TEXT_LENGTH = 10000  
+SKIP_DUPLICATES = True  # False - сохранять почти-дубликаты в duplicates.txt (dz2 их не обрабатывает)
 
 os.makedirs(SAVE_DIR, exist_ok=True)
 
 def download_pages():
     index_entries = []
+    duplicate_entries = []
     pages_downloaded = 0
+    lsh_index = MinHashLSH()
 
     while pages_downloaded < NUM_PAGES:
         url = BASE_URL  
@@ -33,12 +42,23 @@ def download_pages():
             continue
 
         real_url = res.url
-        filename = os.path.join(SAVE_DIR, f"page_{pages_downloaded + 1}.html")
+        signature = lsh_index.signature(content.get_text())
+        duplicate = lsh_index.query(signature) if signature is not None else None
+        if duplicate and SKIP_DUPLICATES:
+            print(f"Пропуск {real_url}: почти-дубликат {duplicate[0]} (сходство {duplicate[1]:.2f})")
+            continue
+
+        page_name = f"page_{pages_downloaded + 1}.html"
+        filename = os.path.join(SAVE_DIR, page_name)
         
         with open(filename, "w", encoding="utf-8") as file:
             file.write(res.text)
 
-        index_entries.append(f"page_{pages_downloaded + 1}.html {real_url}")
+        index_entries.append(f"{page_name} {real_url}")
+        if duplicate:
+            duplicate_entries.append(f"{page_name} {duplicate[0]}")
+        elif signature is not None:
+            lsh_index.add(page_name, signature)
 
         pages_downloaded += 1  
         print(f"Скачано: {real_url} с текстом длиной {text_length} символов")
@@ -46,6 +66,9 @@ def download_pages():
     with open("index.txt", "w", encoding="utf-8") as index_file:
         index_file.write("\n".join(index_entries))
 
+    with open(DUPLICATES_FILE, "w", encoding="utf-8") as duplicates_file:
+        duplicates_file.write("\n".join(duplicate_entries))
+
 if __name__ == "__main__":
     download_pages()
     print("Готово! Все страницы сохранены.")
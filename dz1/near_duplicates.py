@@ -0,0 +1,155 @@
+import os
+import re
+import random
+import zlib
+from collections import defaultdict
+import numpy as np
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+NUM_BANDS = 32
+SIMILARITY_THRESHOLD = 0.8
+DUPLICATES_FILE = "duplicates.txt"
+
+# Простое число Мерсенна для универсального хеширования (a * x + b) mod p.
+# При a < 2^31 и 32-битных шинглах a * x + b помещается в uint64 без переполнения.
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+def get_shingles(text, shingle_size=SHINGLE_SIZE):
+    """
+    Разбивает текст на множество словесных шинглов фиксированной длины.
+    Каждый шингл хешируется в 32-битное число (crc32 стабилен между запусками).
+    """
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < shingle_size:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+    return {
+        zlib.crc32(' '.join(words[i:i + shingle_size]).encode('utf-8'))
+        for i in range(len(words) - shingle_size + 1)
+    }
+
+
+class MinHashLSH:
+    def __init__(self, num_perm=NUM_PERM, num_bands=NUM_BANDS, threshold=SIMILARITY_THRESHOLD, seed=1):
+        """
+        Индекс MinHash-сигнатур с LSH-разбиением на полосы.
+        :param num_perm: длина сигнатуры (число хеш-функций)
+        :param num_bands: число полос; num_perm должно делиться на num_bands
+        :param threshold: порог оценки сходства Жаккара для признания дубликата
+        :param seed: зерно генератора коэффициентов хеш-функций
+        """
+        if num_perm % num_bands != 0:
+            raise ValueError("num_perm должно делиться на num_bands")
+        self.num_perm = num_perm
+        self.num_bands = num_bands
+        self.rows = num_perm // num_bands
+        self.threshold = threshold
+        self.seed = seed
+        rng = random.Random(seed)
+        self.hash_a = np.array([rng.randint(1, MERSENNE_PRIME - 1) for _ in range(num_perm)], dtype=np.uint64)
+        self.hash_b = np.array([rng.randint(0, MERSENNE_PRIME - 1) for _ in range(num_perm)], dtype=np.uint64)
+        self.signatures = {}
+        self.buckets = [defaultdict(list) for _ in range(num_bands)]
+
+    def signature(self, text):
+        """
+        Вычисление MinHash-сигнатуры текста: все хеш-функции применяются
+        ко всем шинглам одной матричной операцией (num_perm x шинглы).
+        :return: массив uint64 длины num_perm или None для текста без слов
+        """
+        shingles = get_shingles(text)
+        if not shingles:
+            return None
+        shingles = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        hashes = (np.outer(self.hash_a, shingles) + self.hash_b[:, None]) % MERSENNE_PRIME
+        return hashes.min(axis=1)
+
+    def _band_keys(self, signature):
+        for band in range(self.num_bands):
+            start = band * self.rows
+            yield band, signature[start:start + self.rows].tobytes()
+
+    def similarity(self, sig1, sig2):
+        """Оценка сходства Жаккара по двум сигнатурам"""
+        return np.count_nonzero(sig1 == sig2) / self.num_perm
+
+    def query(self, signature):
+        """
+        Поиск ближайшего дубликата среди уже добавленных документов.
+        Сравниваются только кандидаты из общих LSH-корзин, а не весь индекс.
+        :return: кортеж (doc_id, сходство) или None
+        """
+        candidates = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self.buckets[band].get(key, ()))
+
+        best = None
+        for doc_id in candidates:
+            score = self.similarity(signature, self.signatures[doc_id])
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (doc_id, score)
+        return best
+
+    def add(self, doc_id, signature):
+        """Добавление сигнатуры документа в индекс"""
+        self.signatures[doc_id] = signature
+        for band, key in self._band_keys(signature):
+            self.buckets[band][key].append(doc_id)
+
+
+def find_duplicate_clusters(pages_dir, index=None):
+    """
+    Группирует уже скачанные страницы в кластеры почти-дубликатов.
+    :return: словарь {представитель кластера: [дубликаты]}
+    """
+    from bs4 import BeautifulSoup
+
+    index = index or MinHashLSH()
+    clusters = defaultdict(list)
+    filenames = sorted(
+        (f for f in os.listdir(pages_dir) if f.startswith("page_") and f.endswith(".html")),
+        key=lambda f: int(f.split("_")[1].split(".")[0])
+    )
+    for filename in filenames:
+        with open(os.path.join(pages_dir, filename), 'r', encoding='utf-8') as file:
+            soup = BeautifulSoup(file.read(), 'html.parser')
+        content = soup.find('div', {'class': 'mw-parser-output'})
+        text = content.get_text() if content else soup.get_text()
+
+        signature = index.signature(text)
+        if signature is None:
+            continue  # пустые страницы не сравниваются между собой
+        duplicate = index.query(signature)
+        if duplicate:
+            clusters[duplicate[0]].append(filename)
+        else:
+            index.add(filename, signature)
+    return dict(clusters)
+
+
+def save_duplicates(clusters, output_file):
+    """
+    Сохраняет кластеры в формате краулера: <дубликат><пробел><представитель кластера>.
+    Этот файл читает dz2, чтобы не обрабатывать дубликаты.
+    """
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write("\n".join(
+            f"{duplicate} {representative}"
+            for representative, duplicates in clusters.items()
+            for duplicate in duplicates
+        ))
+
+
+def main():
+    clusters = find_duplicate_clusters("pages")
+    if not clusters:
+        print("Почти-дубликатов не найдено")
+    for representative, duplicates in clusters.items():
+        print(f"{representative}: {' '.join(duplicates)}")
+    save_duplicates(clusters, DUPLICATES_FILE)
+    print(f"Список дубликатов сохранен в файл: {DUPLICATES_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -136,15 +136,34 @@ def lemmatize_tokens(tokens):
 
     return lemmatized_groups
 
-def process_files(input_dir, tokens_dir, lemmas_dir):
+def load_duplicates(duplicates_file):
+    """
+    Загружает имена страниц, отмеченных краулером как почти-дубликаты.
+    Формат строки: <дубликат><пробел><представитель кластера>.
+    """
+    if not os.path.exists(duplicates_file):
+        return set()
+    with open(duplicates_file, 'r', encoding='utf-8') as f:
+        return {line.split()[0] for line in f if line.strip()}
+
+def process_files(input_dir, tokens_dir, lemmas_dir, duplicates=frozenset()):
     """
     Обрабатывает все файлы в указанной директории, выполняет токенизацию,
     лемматизацию и сохраняет результаты в соответствующие файлы.
+    Почти-дубликаты пропускаются, чтобы не попасть в индекс и TF-IDF.
     """
     os.makedirs(tokens_dir, exist_ok=True)
     os.makedirs(lemmas_dir, exist_ok=True)
 
     for filename in os.listdir(input_dir):
+        if filename in duplicates:
+            # Удаляем результаты прошлых запусков, если страница стала дубликатом
+            for stale_file in (os.path.join(tokens_dir, f"tokens_{filename}.txt"),
+                               os.path.join(lemmas_dir, f"lemmas_{filename}.txt")):
+                if os.path.exists(stale_file):
+                    os.remove(stale_file)
+            continue
+
         if filename.endswith(".html"):
             file_path = os.path.join(input_dir, filename)
             with open(file_path, 'r', encoding='utf-8') as file:
@@ -169,8 +188,9 @@ def main():
     input_directory = os.path.join("..", "dz1", "pages")
     tokens_directory = "tokens"
     lemmas_directory = "lemmas"
+    duplicates = load_duplicates(os.path.join("..", "dz1", "duplicates.txt"))
 
-    process_files(input_directory, tokens_directory, lemmas_directory)
+    process_files(input_directory, tokens_directory, lemmas_directory, duplicates)
     print("Обработка завершена!")
 
 if __name__ == "__main__":
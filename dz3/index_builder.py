@@ -1,5 +1,14 @@
 import os
+import sys
 import json
+from pathlib import Path
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+from dz3.spimi import SpimiRuns
+
+OUT_OF_CORE = False  # True - строить индекс прогонами на диске в пределах MEMORY_LIMIT_MB
+MEMORY_LIMIT_MB = 256
 
 def build_inverted_index(lemmas_dir):
     """
@@ -20,6 +29,35 @@ def build_inverted_index(lemmas_dir):
     inverted_index = {lemma: list(doc_ids) for lemma, doc_ids in inverted_index.items()}
     return inverted_index
 
+def build_inverted_index_out_of_core(lemmas_dir, output_file, memory_limit, runs_dir=None):
+    """
+    Строит инвертированный индекс в ограниченной памяти (SPIMI):
+    списки документов сбрасываются на диск отсортированными прогонами,
+    которые затем сливаются и потоково записываются в файл JSON.
+    """
+    filenames = sorted(
+        (f for f in os.listdir(lemmas_dir) if f.startswith("lemmas_page_") and f.endswith(".txt")),
+        key=lambda f: int(f.split("_")[2].split(".")[0])
+    )
+    runs = SpimiRuns(memory_limit, runs_dir)
+    for filename in filenames:
+        file_id = int(filename.split("_")[2].split(".")[0])  # Извлекаем ID документа
+        with open(os.path.join(lemmas_dir, filename), 'r', encoding='utf-8') as file:
+            for line in file:
+                lemma, forms = line.strip().split(" ", 1)
+                runs.add(lemma, file_id)
+
+    # Документы обходятся по возрастанию ID, поэтому склеенные списки уже отсортированы
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write("{")
+        has_entries = False
+        for lemma, doc_ids in runs.merge():
+            if has_entries:
+                f.write(",")
+            f.write("\n    " + json.dumps(lemma, ensure_ascii=False) + ": " + json.dumps(doc_ids))
+            has_entries = True
+        f.write("\n}" if has_entries else "}")
+
 def save_inverted_index(inverted_index, output_file):
     """
     Сохраняет инвертированный индекс в файл JSON.
@@ -31,6 +69,12 @@ def main():
     lemmas_directory = "../dz2/lemmas"  
     output_file = "inverted_index.json"  
 
+    if OUT_OF_CORE:
+        print(f"Строим инвертированный индекс в пределах {MEMORY_LIMIT_MB} МБ...")
+        build_inverted_index_out_of_core(lemmas_directory, output_file, MEMORY_LIMIT_MB * 1024 * 1024)
+        print(f"Инвертированный индекс сохранен в файл: {output_file}")
+        return
+
     print("Строим инвертированный индекс...")
     inverted_index = build_inverted_index(lemmas_directory)
     print("Индекс построен. Сохраняем в файл...")
@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+import heapq
+import shutil
+import tempfile
+
+
+MAX_OPEN_RUNS = 64
+
+
+class SpimiRuns:
+    def __init__(self, memory_limit, runs_dir=None, max_open_runs=MAX_OPEN_RUNS):
+        """
+        Накопитель списков (SPIMI): хранит {ключ: [значения]} в памяти, пока не
+        превышен бюджет, затем сбрасывает отсортированный прогон на диск.
+        Итоговые списки собираются k-путевым слиянием прогонов.
+        :param memory_limit: бюджет памяти в байтах (оценка)
+        :param runs_dir: директория для прогонов (по умолчанию - временная)
+        :param max_open_runs: сколько прогонов сливается за один проход
+        """
+        if max_open_runs < 2:
+            raise ValueError("max_open_runs должно быть не меньше 2")
+        self.memory_limit = memory_limit
+        self.max_open_runs = max_open_runs
+        self.own_runs_dir = runs_dir is None
+        self.runs_dir = tempfile.mkdtemp(prefix="spimi_") if runs_dir is None else runs_dir
+        os.makedirs(self.runs_dir, exist_ok=True)
+        self.run_files = []
+        self.runs_written = 0
+        self.postings = {}
+        self.memory_used = 0
+
+    def _next_run_file(self):
+        run_file = os.path.join(self.runs_dir, f"run_{self.runs_written}.jsonl")
+        self.runs_written += 1
+        return run_file
+
+    def add(self, key, value):
+        """Добавление значения в список ключа"""
+        values = self.postings.get(key)
+        if values is None:
+            values = self.postings[key] = []
+            self.memory_used += sys.getsizeof(key) + sys.getsizeof(values) + 100
+        values.append(value)
+        self.memory_used += sys.getsizeof(value) + 8
+        if self.memory_used >= self.memory_limit:
+            self.flush()
+
+    def flush(self):
+        """Сброс накопленных списков на диск в виде отсортированного прогона"""
+        if not self.postings:
+            return
+        run_file = self._next_run_file()
+        with open(run_file, 'w', encoding='utf-8') as f:
+            for key in sorted(self.postings):
+                self._write_record(f, key, self.postings[key])
+        self.run_files.append(run_file)
+        self.postings = {}
+        self.memory_used = 0
+
+    def _write_record(self, f, key, values):
+        f.write(json.dumps([key, values], ensure_ascii=False) + "\n")
+
+    def _read_run(self, run_number, run_file):
+        with open(run_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                key, values = json.loads(line)
+                yield key, run_number, values
+
+    def _merge_runs(self, run_files):
+        """
+        K-путевое слияние заданных прогонов. Возвращает пары (ключ, значения)
+        по возрастанию ключа; значения склеиваются в порядке прогонов.
+        """
+        runs = [self._read_run(i, run_file) for i, run_file in enumerate(run_files)]
+        current_key, current_values = None, None
+        try:
+            for key, _, values in heapq.merge(*runs, key=lambda record: (record[0], record[1])):
+                if current_values is not None and key != current_key:
+                    yield current_key, current_values
+                    current_values = None
+                if current_values is None:
+                    current_key, current_values = key, values
+                else:
+                    current_values.extend(values)
+            if current_values is not None:
+                yield current_key, current_values
+        finally:
+            for run in runs:
+                run.close()
+
+    def merge(self):
+        """
+        Многопроходное слияние прогонов: пока прогонов больше max_open_runs,
+        соседние группы сливаются в промежуточные прогоны, поэтому одновременно
+        открыто не больше max_open_runs файлов. Последний проход возвращает
+        пары (ключ, значения) по возрастанию ключа.
+        """
+        self.flush()
+        try:
+            while len(self.run_files) > self.max_open_runs:
+                merged_files = []
+                for start in range(0, len(self.run_files), self.max_open_runs):
+                    group = self.run_files[start:start + self.max_open_runs]
+                    if len(group) == 1:
+                        merged_files.append(group[0])
+                        continue
+                    run_file = self._next_run_file()
+                    with open(run_file, 'w', encoding='utf-8') as f:
+                        for key, values in self._merge_runs(group):
+                            self._write_record(f, key, values)
+                    for merged_run in group:
+                        os.remove(merged_run)
+                    merged_files.append(run_file)
+                self.run_files = merged_files
+            yield from self._merge_runs(self.run_files)
+        finally:
+            self.cleanup()
+
+    def cleanup(self):
+        """Удаление файлов прогонов"""
+        for run_file in self.run_files:
+            if os.path.exists(run_file):
+                os.remove(run_file)
+        self.run_files = []
+        if self.own_runs_dir:
+            shutil.rmtree(self.runs_dir, ignore_errors=True)
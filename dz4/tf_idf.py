@@ -1,6 +1,15 @@
 import os
+import sys
 import math
-from collections import defaultdict
+from collections import defaultdict, Counter
+from pathlib import Path
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+from dz3.spimi import SpimiRuns
+
+OUT_OF_CORE = False  # True - считать TF-IDF прогонами на диске в пределах MEMORY_LIMIT_MB
+MEMORY_LIMIT_MB = 256
 
 def load_documents(tokens_dir, lemmas_dir):
     """
@@ -96,12 +105,93 @@ def save_results(idf, tf_idf, output_dir, prefix):
             for term in term_scores.keys():
                 f.write(f"{term} {idf[term]} {tf_idf[doc_id][term]}\n")
 
+def iter_documents(tokens_dir, lemmas_dir):
+    """
+    Потоково читает документы по одному в порядке возрастания ID.
+    Возвращает тройки (doc_id, токены, [(лемма, формы)]); вместо списка лемм
+    возвращается None, если у документа нет файла с леммами.
+    """
+    filenames = sorted(
+        (f for f in os.listdir(tokens_dir) if f.startswith("tokens_page_") and f.endswith(".txt")),
+        key=lambda f: int(f.split("_")[2].split(".")[0])
+    )
+    for filename in filenames:
+        file_id = filename.split("_")[2].split(".")[0]  # Извлекаем ID документа
+        with open(os.path.join(tokens_dir, filename), 'r', encoding='utf-8') as f:
+            tokens = f.read().split()
+        lemmas = None
+        lemmas_file = os.path.join(lemmas_dir, "lemmas_" + filename[len("tokens_"):])
+        if os.path.exists(lemmas_file):
+            lemmas = []
+            with open(lemmas_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    lemma, forms = line.strip().split(" ", 1)
+                    lemmas.append((lemma, forms.split()))
+        yield int(file_id), tokens, lemmas
+
+def save_results_out_of_core(term_runs, num_docs, output_dir, prefix, memory_limit):
+    """
+    Сливает прогоны {термин: [(doc_id, tf)]}, вычисляет IDF по длине списка
+    и через второй набор прогонов {doc_id: [(термин, idf, tf-idf)]}
+    записывает результаты в том же формате, что и save_results.
+    Файлы документов без терминов создаются заранее в process_out_of_core.
+    """
+    doc_runs = SpimiRuns(memory_limit)
+    for term, postings in term_runs.merge():
+        idf = math.log(num_docs / len(postings))
+        for doc_id, tf in postings:
+            doc_runs.add(doc_id, (term, idf, tf * idf))
+
+    for doc_id, term_scores in doc_runs.merge():
+        output_file = os.path.join(output_dir, f"{prefix}_page_{doc_id}.txt")
+        with open(output_file, 'w', encoding='utf-8') as f:
+            for term, idf, tf_idf in term_scores:
+                f.write(f"{term} {idf} {tf_idf}\n")
+
+def process_out_of_core(tokens_dir, lemmas_dir, output_terms_dir, output_lemmas_dir, memory_limit):
+    """
+    Вычисляет TF-IDF для токенов и лемм в ограниченной памяти (SPIMI):
+    в памяти одновременно находится один документ и списки не больше бюджета.
+    """
+    memory_limit //= 2  # бюджет делится между прогонами токенов и лемм
+    term_runs = SpimiRuns(memory_limit)
+    lemma_runs = SpimiRuns(memory_limit)
+    num_term_docs = 0
+    num_lemma_docs = 0
+    os.makedirs(output_terms_dir, exist_ok=True)
+    os.makedirs(output_lemmas_dir, exist_ok=True)
+
+    for doc_id, tokens, lemmas in iter_documents(tokens_dir, lemmas_dir):
+        # Как и save_results, создаем файл для каждого документа, даже без терминов
+        num_term_docs += 1
+        open(os.path.join(output_terms_dir, f"terms_page_{doc_id}.txt"), 'w', encoding='utf-8').close()
+        token_counts = Counter(tokens)
+        for term, count in token_counts.items():
+            term_runs.add(term, (doc_id, count))
+
+        if lemmas is None:
+            continue
+        num_lemma_docs += 1
+        open(os.path.join(output_lemmas_dir, f"lemmas_page_{doc_id}.txt"), 'w', encoding='utf-8').close()
+        for lemma, forms in lemmas:
+            lemma_runs.add(lemma, (doc_id, sum(token_counts[form] for form in forms)))
+
+    save_results_out_of_core(term_runs, num_term_docs, output_terms_dir, "terms", memory_limit)
+    save_results_out_of_core(lemma_runs, num_lemma_docs, output_lemmas_dir, "lemmas", memory_limit)
+
 def main():
     tokens_dir = "../dz2/tokens"  # Путь к папке с токенами
     lemmas_dir = "../dz2/lemmas"  # Путь к папке с леммами
     output_terms_dir = "tf_idf_terms"  # Папка для сохранения TF-IDF для токенов
     output_lemmas_dir = "tf_idf_lemmas"  # Папка для сохранения TF-IDF для лемм
 
+    if OUT_OF_CORE:
+        print(f"Вычисляем TF-IDF для токенов и лемм в пределах {MEMORY_LIMIT_MB} МБ...")
+        process_out_of_core(tokens_dir, lemmas_dir, output_terms_dir, output_lemmas_dir,
+                            MEMORY_LIMIT_MB * 1024 * 1024)
+        print("Готово!")
+        return
+
     print("Загружаем документы...")
     documents_tokens, documents_lemmas = load_documents(tokens_dir, lemmas_dir)
 
@@ -0,0 +1,62 @@
+from typing import Dict, List, Tuple, Iterable
+
+
+class _TrieNode:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.top: Tuple[str, ...] = ()
+
+
+class Autocomplete:
+    def __init__(self, inverted_index: Dict[str, Iterable[int]], max_suggestions: int = 10):
+        """
+        Префиксное дерево по словарю инвертированного индекса.
+        В каждом узле заранее сохраняются лучшие завершения, поэтому запрос
+        стоит O(длина префикса) и не требует обхода словаря.
+        :param inverted_index: инвертированный индекс {термин: список документов}
+        :param max_suggestions: количество завершений, хранимых в каждом узле
+        """
+        self.max_suggestions = max_suggestions
+        self.doc_freq = {term: len(doc_ids) for term, doc_ids in inverted_index.items()}
+        self.root = _TrieNode()
+        for term in self.doc_freq:
+            node = self.root
+            for char in term:
+                node = node.children.setdefault(char, _TrieNode())
+            node.top = (term,)
+        self._precompute_top(self.root)
+
+    def _rank_key(self, term: str) -> Tuple[int, str]:
+        """Сортировка по убыванию документной частоты, затем по алфавиту"""
+        return -self.doc_freq[term], term
+
+    def _precompute_top(self, node: _TrieNode) -> Tuple[str, ...]:
+        """Заполнение списков лучших завершений снизу вверх"""
+        candidates = list(node.top)
+        for child in node.children.values():
+            candidates.extend(self._precompute_top(child))
+        candidates.sort(key=self._rank_key)
+        node.top = tuple(candidates[:self.max_suggestions])
+        return node.top
+
+    def complete(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Дополнение последнего слова запроса
+        :param query: введенный текст
+        :param limit: максимальное количество подсказок
+        :return: список дополненных запросов
+        """
+        words = query.lower().split()
+        if not words or query[-1].isspace():
+            return []
+
+        node = self.root
+        for char in words[-1]:
+            node = node.children.get(char)
+            if node is None:
+                return []
+
+        prefix = " ".join(words[:-1])
+        return [f"{prefix} {term}" if prefix else term for term in node.top[:limit]]
@@ -0,0 +1,137 @@
+import os
+import time
+import hashlib
+from multiprocessing import Pool
+from typing import List, Tuple, Optional
+import numpy as np
+from scipy import sparse
+
+_matrix: Optional[sparse.csr_matrix] = None
+_matrix_t: Optional[sparse.csr_matrix] = None
+_top_k = 0
+_block_size = 0
+
+
+def load_tf_idf_matrix(tf_idf_dir: str) -> Tuple[List[str], sparse.csr_matrix]:
+    """
+    Загрузка TF-IDF векторов документов в разреженную матрицу (документы x термины)
+    :param tf_idf_dir: директория с TF-IDF значениями
+    :return: список ID документов и матрица с нормированными строками
+    """
+    term_to_id = {}
+    doc_ids, rows, cols, values = [], [], [], []
+    filenames = sorted(
+        (f for f in os.listdir(tf_idf_dir) if f.startswith("terms_page_") and f.endswith(".txt")),
+        key=lambda f: int(f.split("_")[2].split(".")[0])
+    )
+    for row, filename in enumerate(filenames):
+        doc_ids.append(filename.split("_")[2].split(".")[0])
+        with open(os.path.join(tf_idf_dir, filename), 'r', encoding='utf-8') as f:
+            for line in f:
+                term, idf, tf_idf = line.strip().split()
+                if float(tf_idf) == 0:
+                    continue
+                rows.append(row)
+                cols.append(term_to_id.setdefault(term, len(term_to_id)))
+                values.append(float(tf_idf))
+
+    matrix = sparse.csr_matrix(
+        (np.array(values, dtype=np.float32), (rows, cols)),
+        shape=(len(doc_ids), len(term_to_id))
+    )
+    # После нормировки строк скалярное произведение равно косинусному сходству
+    norms = np.sqrt(matrix.multiply(matrix).sum(axis=1)).A1
+    norms[norms == 0] = 1
+    matrix = sparse.diags(1 / norms).dot(matrix).tocsr()
+    return doc_ids, matrix
+
+
+def _init_worker(matrix: sparse.csr_matrix, top_k: int, block_size: int) -> None:
+    global _matrix, _matrix_t, _top_k, _block_size
+    _matrix = matrix
+    _matrix_t = matrix.T.tocsr()  # CSR x CSR: без преобразования формата на каждом блоке
+    _top_k = top_k
+    _block_size = block_size
+
+
+def _top_k_block(start: int) -> Tuple[int, np.ndarray, np.ndarray]:
+    """Вычисление top-k соседей для блока строк; в памяти только блок x N сходств"""
+    block = _matrix[start:start + _block_size]
+    sims = (block @ _matrix_t).toarray()
+    local_rows = np.arange(sims.shape[0])
+    sims[local_rows, start + local_rows] = -1  # документ не является соседом самому себе
+
+    indices = np.argpartition(-sims, _top_k - 1, axis=1)[:, :_top_k]
+    scores = np.take_along_axis(sims, indices, axis=1)
+    order = np.argsort(-scores, axis=1)
+    indices = np.take_along_axis(indices, order, axis=1)
+    scores = np.take_along_axis(scores, order, axis=1)
+    return start, indices.astype(np.int32), scores.astype(np.float32)
+
+
+def build_neighbour_table(matrix: sparse.csr_matrix, top_k: int = 10, block_size: int = 256,
+                          workers: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Построение таблицы top-k ближайших соседей для всех документов
+    :param matrix: матрица документов с нормированными строками
+    :param top_k: количество соседей на документ
+    :param block_size: количество строк в одном блоке умножения
+    :param workers: количество процессов (по умолчанию - число ядер)
+    :return: матрицы индексов соседей и их сходств размера (N, top_k)
+    """
+    num_docs = matrix.shape[0]
+    top_k = min(top_k, num_docs - 1)
+    indices = np.zeros((num_docs, max(top_k, 0)), dtype=np.int32)
+    scores = np.zeros((num_docs, max(top_k, 0)), dtype=np.float32)
+    if top_k <= 0:
+        return indices, scores
+
+    starts = range(0, num_docs, block_size)
+    with Pool(workers, initializer=_init_worker, initargs=(matrix, top_k, block_size)) as pool:
+        for start, block_indices, block_scores in pool.imap_unordered(_top_k_block, starts):
+            indices[start:start + len(block_indices)] = block_indices
+            scores[start:start + len(block_scores)] = block_scores
+    return indices, scores
+
+
+def tf_idf_fingerprint(tf_idf_dir: str) -> str:
+    """Хеш имен и содержимого TF-IDF файлов; не зависит от времени изменения файлов"""
+    digest = hashlib.blake2b(digest_size=16)
+    for filename in sorted(os.listdir(tf_idf_dir)):
+        if filename.startswith("terms_page_") and filename.endswith(".txt"):
+            digest.update(filename.encode('utf-8'))
+            with open(os.path.join(tf_idf_dir, filename), 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def save_neighbour_table(output_file: str, doc_ids: List[str], indices: np.ndarray, scores: np.ndarray,
+                         fingerprint: str) -> None:
+    """Сохранение таблицы соседей в компактном бинарном формате"""
+    np.savez_compressed(output_file, doc_ids=np.array(doc_ids), indices=indices, scores=scores,
+                        fingerprint=np.array(fingerprint))
+
+
+def build_neighbour_file(tf_idf_dir: str, output_file: str, top_k: int = 10, workers: Optional[int] = None) -> None:
+    """Построение таблицы соседей по TF-IDF файлам и сохранение ее на диск"""
+    start_time = time.time()
+    fingerprint = tf_idf_fingerprint(tf_idf_dir)
+    print("Загрузка TF-IDF матрицы...")
+    doc_ids, matrix = load_tf_idf_matrix(tf_idf_dir)
+
+    print(f"Вычисление соседей для {len(doc_ids)} документов...")
+    indices, scores = build_neighbour_table(matrix, top_k=top_k, workers=workers)
+
+    save_neighbour_table(output_file, doc_ids, indices, scores, fingerprint)
+    print(f"Таблица соседей сохранена в файл: {output_file} ({time.time() - start_time:.2f} секунд)")
+
+
+def main():
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    tf_idf_dir = os.path.join(base_dir, "dz4", "tf_idf_terms")
+    output_file = os.path.join(base_dir, "dz5", "neighbours.npz")
+    build_neighbour_file(tf_idf_dir, output_file)
+
+
+if __name__ == "__main__":
+    main()
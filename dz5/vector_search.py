@@ -1,23 +1,32 @@
 import os
+import sys
 import math
 import json
 from collections import defaultdict
 import numpy as np
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 import time
 import re
 from bs4 import BeautifulSoup
+from pathlib import Path
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+from dz5.similar_documents import tf_idf_fingerprint
 
 
 class VectorSearch:
-    def __init__(self, tf_idf_dir: str, inverted_index_path: str):
+    def __init__(self, tf_idf_dir: str, inverted_index_path: str, neighbours_path: Optional[str] = None):
         """
         Инициализация поисковой системы
         :param tf_idf_dir: директория с TF-IDF значениями
         :param inverted_index_path: путь к файлу с инвертированным индексом
+        :param neighbours_path: путь к таблице соседей (строится python dz5/similar_documents.py)
         """
         self.tf_idf_dir = tf_idf_dir
         self.inverted_index_path = inverted_index_path
+        self.neighbours_path = neighbours_path
+        self.neighbour_rows: Dict[str, int] = {}
         self.doc_vectors: Dict[str, np.ndarray] = {}
         self.term_to_id: Dict[str, int] = {}
         self.id_to_term: Dict[int, str] = {}
@@ -45,6 +54,32 @@ class VectorSearch:
 
         print(f"Загружено {len(self.doc_vectors)} документов и {len(self.term_to_id)} уникальных терминов")
 
+        if self.neighbours_path:
+            self._load_neighbours()
+
+    def _load_neighbours(self) -> None:
+        """
+        Загрузка таблицы похожих документов. Таблица строится офлайн;
+        если она отсутствует или построена по другим TF-IDF файлам,
+        похожие документы недоступны.
+        """
+        if not os.path.exists(self.neighbours_path):
+            print(f"Предупреждение: таблица похожих документов {self.neighbours_path} не найдена, "
+                  f"запустите python dz5/similar_documents.py")
+            return
+
+        print("Загрузка таблицы похожих документов...")
+        with np.load(self.neighbours_path) as data:
+            fingerprint = str(data["fingerprint"]) if "fingerprint" in data.files else None
+            if fingerprint != tf_idf_fingerprint(self.tf_idf_dir):
+                print("Предупреждение: таблица похожих документов устарела, "
+                      "перестройте ее: python dz5/similar_documents.py")
+                return
+            self.neighbour_doc_ids = [str(doc_id) for doc_id in data["doc_ids"]]
+            self.neighbour_indices = data["indices"]
+            self.neighbour_scores = data["scores"]
+        self.neighbour_rows = {doc_id: i for i, doc_id in enumerate(self.neighbour_doc_ids)}
+
     def _load_doc_vector(self, filepath: str) -> np.ndarray:
         """Загрузка вектора документа из файла"""
         vector = np.zeros(len(self.term_to_id))
@@ -112,6 +147,24 @@ class VectorSearch:
 
         return results[:top_k]
 
+    def similar_documents(self, doc_id: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Поиск документов, похожих на заданный, по предвычисленной таблице соседей
+        :param doc_id: ID документа
+        :param top_k: количество возвращаемых результатов (от 1 до размера таблицы)
+        :return: список кортежей (doc_id, score)
+        """
+        row = self.neighbour_rows.get(doc_id)
+        if row is None:
+            return []
+        top_k = max(1, min(top_k, self.neighbour_indices.shape[1]))
+
+        results = []
+        for index, score in zip(self.neighbour_indices[row, :top_k], self.neighbour_scores[row, :top_k]):
+            if score > 0:
+                results.append((self.neighbour_doc_ids[index], float(score)))
+        return results
+
     def _extract_text_from_html(self, html_content: str) -> str:
         """Извлечение текста из HTML"""
         soup = BeautifulSoup(html_content, 'html.parser')
@@ -189,7 +242,8 @@ def main():
     print("Инициализация поисковой системы...")
     searcher = VectorSearch(
         tf_idf_dir=os.path.join(os.path.dirname(os.path.dirname(__file__)), "dz4", "tf_idf_terms"),
-        inverted_index_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), "dz3", "inverted_index.json")
+        inverted_index_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), "dz3", "inverted_index.json"),
+        neighbours_path=os.path.join(os.path.dirname(__file__), "neighbours.npz")
     )
 
     # Пример использования